@@ -2,9 +2,26 @@
 # See the LICENSE.rst file for licensing information.
 
 import datetime
-from numpy import array, append, arange, logical_not, log10, nan, isnan, linspace, amax, amin
+import functools
+import mmap
+import os
+from numpy import array, logical_not, log10, nan, isnan, linspace, amax, amin
+from numpy import empty, frombuffer, full, int8, uint8, float64, clip, maximum, asarray, concatenate
+from numpy import stack, column_stack, zeros_like, ascontiguousarray, flatnonzero
 import re
-import pdb
+
+## Note: numpy's `append` is deliberately not imported here -- growing arrays one element at a time
+## re-allocates the whole buffer on every call. Dynamic growth in this module uses Python lists or
+## preallocated ndarrays instead.
+
+try:
+    from numba import njit
+except ImportError:
+    ## If numba is not installed, fall back to running the parsing kernel as ordinary Python code.
+    def njit(*args, **kwargs):
+        def wrapper(func):
+            return(func)
+        return(wrapper)
 
 '''
 jcamp.py contains functions useful for parsing JCAMP-DX formatted files containing spectral data. The main
@@ -30,6 +47,27 @@ DIF_digits = {'%': 0, 'J':1,  'K':2,  'L':3,  'M':4,  'N':5,  'O':6,  'P':7,  'Q
               'j':-1, 'k':-2, 'l':-3, 'm':-4, 'n':-5, 'o':-6, 'p':-7, 'q':-8, 'r':-9}
 DUP_digits = {'S':1, 'T':2, 'U':3, 'V':4, 'W':5, 'X':6, 'Y':7, 'Z':8, 's':9}
 
+## Byte-indexed lookup tables used by the compiled parsing kernel. Indexing by ASCII code replaces
+## the per-character dict lookups of the old pure-Python loop with a single array load.
+## `SQZ_SIGN[b]` is +1/-1 for SQZ codes (including the PAC '+'/'-' delimiters), 0 otherwise.
+## `SQZ_DIGIT[b]` is the leading digit encoded by an SQZ code, or -1 if the code carries no digit.
+## `DIF_VAL[b]` is the signed leading digit of a DIF code, with 127 as the "not a DIF code" sentinel.
+## `DUP_MUL[b]` is the repeat count encoded by a DUP code, or 0 if the byte is not a DUP code.
+SQZ_SIGN = full(256, 0, dtype=int8)
+SQZ_DIGIT = full(256, -1, dtype=int8)
+DIF_VAL = full(256, 127, dtype=int8)
+DUP_MUL = full(256, 0, dtype=uint8)
+for (_c,_s) in SQZ_digits.items():
+    if (_s == ' '): continue        ## ',' maps to a plain delimiter and is handled as whitespace
+    SQZ_SIGN[ord(_c)] = 1 if (_s[0] == '+') else -1
+    if (len(_s) > 1):
+        SQZ_DIGIT[ord(_c)] = int(_s[1])
+for (_c,_v) in DIF_digits.items():
+    DIF_VAL[ord(_c)] = _v
+for (_c,_v) in DUP_digits.items():
+    DUP_MUL[ord(_c)] = _v
+del _c, _s, _v
+
 ## The specification allows multiple formats for representing LONGDATE.
 ## See `FRACTIONAL_SECONDS_PATTERN` below for the optional token representing fractional seconds.
 ## These fractional seconds are removed in advance. Thus `%N` is not referenced in the formats below.
@@ -42,6 +80,15 @@ FRACTIONAL_SECONDS_PATTERN = re.compile(
     r"^\d{4}/\d{2}/\d{2} +\d{2}:\d{2}\d{2}(?P<fractional_seconds>\d{1,9})"
 )
 
+## Matches ordinary fixed-point and exponent-notation numbers. Testing against this is cheaper than
+## calling float() and catching the ValueError for non-numeric strings.
+FLOAT_PATTERN = re.compile(r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$')
+
+## Classifies the compound-file block markers with one anchored match: the alternation compiles to
+## a single scanning automaton, so a line is tested against both labels in one pass instead of one
+## slice-and-uppercase comparison per label.
+BLOCK_MARKER_PATTERN = re.compile(r'##(TITLE|END)', re.IGNORECASE)
+
 ##=====================================================================================================
 def jcamp_readfile(filename):
     '''
@@ -58,8 +105,25 @@ def jcamp_readfile(filename):
         The dictionary containing the file information --- header and data both.
     '''
 
+    ## Memory-map the file and hand a view of the mapping to `jcamp_read`: the parser slices its
+    ## lines directly out of the mapping, so the file contents are never copied wholesale and data
+    ## lines reach the decode kernel without per-line bytes allocations.
     with open(filename, 'rb') as filehandle:
-        datadict = jcamp_read(filehandle)
+        try:
+            mm = mmap.mmap(filehandle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            ## mmap cannot map an empty file; fall back to the plain file iterator.
+            datadict = jcamp_read(filehandle)
+        else:
+            try:
+                datadict = jcamp_read(memoryview(mm))
+            finally:
+                try:
+                    mm.close()
+                except BufferError:
+                    ## A propagating parse error can keep line views alive in its traceback; in
+                    ## that case leave the mapping for the garbage collector to reclaim.
+                    pass
     datadict['filename'] = filename
     return(datadict)
 
@@ -103,6 +167,115 @@ def parse_longdate(date_string: str) -> datetime.datetime:
     else:
         raise ValueError("Failed to parse the date string: {}".format(date_string))
 
+##=====================================================================================================
+def _read_xydata_block(lines, start, jcamp_dict, dx):
+    '''
+    Specialized reader for '(X++(Y..Y))' data blocks --- the dominant format in the IR databases.
+
+    Consume data lines from `lines` beginning at index `start` until the next header line, writing the
+    y-values into a preallocated buffer sized from "npoints" when available. Running the block in its
+    own tight loop bypasses the per-line branch cascade of `jcamp_read`, which otherwise has to
+    re-discriminate between five mutually-exclusive data formats on every line.
+
+    Parameters
+    ----------
+    lines : list of str, bytes, or memoryview
+        All lines of the file (or block) being read.
+    start : int
+        The index of the first data line of the block.
+    jcamp_dict : dict
+        The header dictionary collected so far; consulted for "npoints".
+    dx : float
+        The x-step between successive data points, used for the x-checks.
+
+    Returns
+    -------
+    y : numpy.ndarray
+        The collected y-values.
+    stop : int
+        The index of the first line not consumed by the block.
+    '''
+
+    ## "npoints" tells us the final size before the data block starts; a small pad absorbs any extra
+    ## values on the last line. Without it, start small and grow by doubling.
+    if ('npoints' in jcamp_dict):
+        y_buf = empty(jcamp_dict['npoints'] + 16, dtype=float64)
+    else:
+        y_buf = empty(1024, dtype=float64)
+    y_cursor = 0
+    ASDF_format_detected = False
+    line_last = None        ## set after the first data line; carries (x, y-count) for the x-check
+
+    i = start
+    nlines = len(lines)
+    while (i < nlines):
+        raw = lines[i]
+        if isinstance(raw, str):
+            line = raw
+            raw = None
+        else:
+            line = str(raw, 'utf-8', 'ignore')
+        stripped = line.strip()
+        if not stripped:
+            i += 1
+            continue
+        prefix = line[:2]       ## anchored to the raw line: an indented '##' or '$$' is not a marker
+        if (prefix == '##'):
+            break               ## the next header line ends the data block
+        if (prefix == '$$'):
+            i += 1
+            continue
+        i += 1
+
+        ## Check the first data line only if ASDF format is implemented.
+        if (y_cursor == 0):
+            ## Check if the format is AFFN or ASDF. With the raw bytes in hand this is a single
+            ## vectorized gather through the DIF table rather than a per-character dict lookup.
+            if (raw is not None):
+                ASDF_format_detected = bool((DIF_VAL[frombuffer(raw, dtype=uint8)] != 127).any())
+            else:
+                ASDF_format_detected = any(l in DIF_digits for l in stripped)
+        datavals = jcamp_parse(stripped if (raw is None) else raw)
+
+        ## X-check: Is the calculated x-value the same as in first value in line?
+        ##          Actual implementation checks whether difference is below 1.
+        ##          This threshold might require adjustment to higher values if needed (not encountered so far).
+        ## line_last will be generated after reading first line, see code below.
+        if line_last is not None:
+            next_x = line_last[0] + line_last[1] * dx
+            if (abs(datavals[0] - next_x) > 1):
+                print(f"X-Check failed. Expected value is {datavals[0]} but {next_x} has been calculated.")
+
+        ## Only for ASDF format: Do y-checks (to ensure line integrity) and
+        ##                       do y-value aggregation appropriately
+        if ASDF_format_detected and y_cursor:
+            line_last = (datavals[0], len(datavals[2:]))
+            ## Y-check: first y-value is used to check with last y-value to ensure integrity of all DIF
+            ##          operations done on previous line
+            if (datavals[1] != y_buf[y_cursor-1]):
+                print(f"Y-Check failed. Last value of previous line is {y_buf[y_cursor-1]} but first value is {datavals[1]}.")
+            vals = datavals[2:]
+        elif ASDF_format_detected:
+            ## First line does not contain y-checks.
+            vals = datavals[1:]
+            ## Define last x and number of y-values for next x-check.
+            line_last = (datavals[0], len(vals) - 1)
+        else:
+            vals = datavals[1:]
+            line_last = (datavals[0], len(vals))
+
+        ## Aggregate y-values with a single slice-assignment into the preallocated buffer.
+        nvals = len(vals)
+        if (y_cursor + nvals) > y_buf.size:
+            ## More values than "npoints" promised (or no "npoints" at all); grow the buffer.
+            newbuf = empty(2 * (y_cursor + nvals), dtype=float64)
+            newbuf[:y_cursor] = y_buf[:y_cursor]
+            y_buf = newbuf
+        y_buf[y_cursor:y_cursor+nvals] = vals
+        y_cursor += nvals
+
+    return(y_buf[:y_cursor], i)
+
 ##=====================================================================================================
 def jcamp_read(filehandle):
     '''
@@ -111,8 +284,10 @@ def jcamp_read(filehandle):
 
     Parameters
     ----------
-    filehandle : file object
-        The object representing the JCAMP-DX filename to read.
+    filehandle : file object, bytes, memoryview, or list of str
+        The object representing the JCAMP-DX file to read: an open binary file handle, the complete
+        file contents as bytes, a memoryview over a memory-mapped file, or a list of
+        already-decoded lines (used for compound blocks).
 
     Returns
     -------
@@ -120,27 +295,74 @@ def jcamp_read(filehandle):
         The dictionary containing the header and data vectors.
     '''
 
+    if isinstance(filehandle, memoryview):
+        ## The file arrived as a view of a memory mapping. Find the line breaks with one vectorized
+        ## scan and slice the view into per-line sub-views: no per-line bytes objects are allocated,
+        ## and data lines reach the decode kernel as zero-copy windows onto the mapping itself.
+        buf = frombuffer(filehandle, dtype=uint8)
+        lines = []
+        pos = 0
+        nbytes = buf.size
+        for j in flatnonzero((buf == 0x0A) | (buf == 0x0D)).tolist():
+            if (j < pos):
+                continue        ## the LF of a CRLF pair, already consumed with its CR
+            lines.append(filehandle[pos:j])
+            pos = j + 1
+            if (buf[j] == 0x0D) and (pos < nbytes) and (buf[pos] == 0x0A):
+                pos += 1
+        if (pos < nbytes):
+            lines.append(filehandle[pos:])
+    elif isinstance(filehandle, (bytes, bytearray)):
+        ## The whole file was handed over as one byte string: split it into lines in a single pass.
+        lines = filehandle.splitlines()
+    elif isinstance(filehandle, list):
+        lines = filehandle
+    else:
+        ## Materialize the lines so that data blocks can be consumed by index below.
+        lines = list(filehandle)
+
     jcamp_dict = {}
     y = []
     x = []
+    x_chunks = []
+    y_chunks = []
     datastart = False
     is_compound = False
     in_compound_block = False
     compound_block_contents = []
-    re_num = re.compile(r'\d+')
     lhs = None
-    for line in filehandle:
-        ## When parsing compound files, the input is an array of strings, so no need to decode it twice.
-        if hasattr(line, 'decode'):
-            line = line.decode('utf-8','ignore')
+    nlines = len(lines)
+    i = 0
+    while (i < nlines):
+        line = lines[i]
+        i += 1
 
-        if not line.strip():
+        ## When parsing compound files, the input is an array of strings, so no need to decode it twice.
+        ## Keep the raw bytes (or view) around: data lines then feed the parsing kernel without a
+        ## re-encode.
+        if isinstance(line, str):
+            raw = None
+        else:
+            raw = line
+            line = str(line, 'utf-8', 'ignore')
+
+        ## Strip the line once up front and dispatch on the two-character prefix: the old cascade of
+        ## strip()/startswith()/upper() calls allocated several transient strings for every line.
+        ## The prefix is anchored to the raw line, not the stripped one -- an indented '$$' or '##'
+        ## is content (e.g. inside a multiline field such as an embedded MOL file), not a marker.
+        stripped = line.strip()
+        if not stripped:
             continue
-        if line.startswith('$$'):
+        prefix = line[:2]
+        if (prefix == '$$'):
             continue
 
-        ## Detect the start of a compound block
-        if is_compound and line.upper().startswith('##TITLE'):
+        ## Classify block-boundary markers, but only inside compound files: ordinary files never
+        ## need the match.
+        marker = BLOCK_MARKER_PATTERN.match(stripped) if (is_compound and (prefix == '##')) else None
+
+        ## Detect the start of a compound block.
+        if (marker is not None) and (marker.group(1).upper() == 'TITLE'):
             in_compound_block = True
             compound_block_contents = [line]
             continue
@@ -152,7 +374,7 @@ def jcamp_read(filehandle):
             compound_block_contents.append(line)
 
             ## Detect the end of the compound block.
-            if line.upper().startswith('##END'):
+            if (marker is not None) and (marker.group(1).upper() == 'END'):
                 ## Process the entire block and put it into the children array.
                 jcamp_dict['children'].append(jcamp_read(compound_block_contents))
                 in_compound_block = False
@@ -160,9 +382,8 @@ def jcamp_read(filehandle):
             continue
 
         ## Lines beginning with '##' are header lines.
-        if line.startswith('##'):
-            line = line.strip('##')
-            (lhs,rhs) = line.split('=', 1)
+        if (prefix == '##'):
+            (lhs,rhs) = stripped.strip('##').split('=', 1)
             lhs = lhs.strip().lower()
             rhs = rhs.strip()
             #continuation = rhs.endswith('=')
@@ -187,6 +408,8 @@ def jcamp_read(filehandle):
                 ## This is a new data entry, reset x and y.
                 x = []
                 y = []
+                x_chunks = []
+                y_chunks = []
                 datastart = True
                 datatype = rhs
 
@@ -197,9 +420,16 @@ def jcamp_read(filehandle):
                 else:
                     dx = 1.0
                 dx /= jcamp_dict.get("xfactor",1)
+
+                if (rhs == '(X++(Y..Y))'):
+                    ## Hand the whole data block to the specialized reader, which consumes the lines
+                    ## in one tight loop rather than re-entering the branch cascade for each line.
+                    (y, i) = _read_xydata_block(lines, i, jcamp_dict, dx)
+                    datastart = False
                 continue        ## data starts on next line
             elif (lhs == 'end'):
-                bounds = [int(i) for i in re_num.findall(rhs)]
+                ## A plain split is enough here; no need to run the regex engine over the line.
+                bounds = [int(tok) for tok in rhs.replace(',', ' ').split() if tok.lstrip('-').isdigit()]
                 datastart = True
                 datatype = bounds
                 datalist = []
@@ -216,71 +446,31 @@ def jcamp_read(filehandle):
             elif datastart:
                 datastart = False
         elif lhs is not None and not datastart:  # multiline entry
-            jcamp_dict[lhs] += '\n{}'.format(line.strip())
-
-        if datastart and (datatype == '(X++(Y..Y))'):
-            ## If the line does not start with '##' or '$$' then it should be a data line.
-            ## The pair of lines below involve regex splitting on floating point numbers and integers. We can't just
-            ## split on spaces because JCAMP allows minus signs to replace spaces in the case of negative numbers.
-
-            ## Check the first data line only if ASDF format is implemented.
-            if not len(y):
-                ## Check if the format is AFFN or ASDF:
-                if any(l in DIF_digits for l in line):
-                    ASDF_format_detected = True
-                else:
-                    ASDF_format_detected = False
-            datavals = jcamp_parse(line)
-
-            ## X-check: Is the calculated x-value the same as in first value in line?
-            ##          Actual implementation checks whether difference is below 1.
-            ##          This threshold might require adjustment to higher values if needed (not encountered so far).
-            ## line_last will be generated after reading first line, see code below.
-            if "line_last" in locals():
-                next_x = line_last[0] + line_last[1] * dx
-                if (abs(datavals[0] - next_x) > 1):
-                    print(f"X-Check failed. Expected value is {datavals[0]} but {next_x} has been calculated.")
-
-            ## Only for ASDF format: Do y-checks (to ensure line integrity) and
-            ##                       do y-value aggregation appropriately
-            if ASDF_format_detected:
-                if len(y):
-                    line_last = (datavals[0], len(datavals[2:]))
-                    ## Y-check: first y-value is used to check with last y-value to ensure integrity of all DIF
-                    ##          operations done on previous line
-                    if (datavals[1] != y[-1]):
-                        print(f"Y-Check failed. Last value of previous line is {y[-1]} but first value is {datavals[1]}.")
-                    ## Aggregate y-values.
-                    for dataval in datavals[2:]:
-                        y.append(float(dataval))
-                else:
-                    ## Aggregate y-values; first line does not contain y-checks.
-                    for dataval in datavals[1:]:
-                        y.append(float(dataval))
-                    ## Define last x and number of y-values for next x-check.
-                    line_last = (datavals[0], len(y) - 1)
-            else:
-                line_last = (datavals[0], len(datavals[1:]))
-                for dataval in datavals[1:]:
-                    y.append(float(dataval))
-
-        elif datastart and (('xypoints' in jcamp_dict) or ('xydata' in jcamp_dict)) and (datatype == '(XY..XY)'):
-            datavals = [v.strip() for v in re.split(r"[,;\s]", line) if v]  ## be careful not to allow empty strings
-            if not all(is_float(datavals)): continue
-            datavals = array(datavals)
-            x.extend(datavals[0::2])        ## every other data point starting at the zeroth
-            y.extend(datavals[1::2])        ## every other data point starting at the first
+            jcamp_dict[lhs] += '\n{}'.format(stripped)
+
+        if datastart and (('xypoints' in jcamp_dict) or ('xydata' in jcamp_dict)) and (datatype == '(XY..XY)'):
+            try:
+                ## Normalize the delimiters with two C-level replaces and let NumPy's parser convert
+                ## the tokens; str.split discards empty strings on its own.
+                datavals = array(stripped.replace(',', ' ').replace(';', ' ').split(), dtype=float64)
+            except ValueError:
+                continue        ## skip any line containing non-numeric tokens
+            x_chunks.append(datavals[0::2])     ## every other data point starting at the zeroth
+            y_chunks.append(datavals[1::2])     ## every other data point starting at the first
         elif datastart and ('peak table' in jcamp_dict) and (datatype == '(XY..XY)'):
-            datavals = [v.strip() for v in re.split(r"[,;\s]", line) if v]  ## be careful not to allow empty strings
-            if not all(is_float(datavals)): continue
-            datavals = array(datavals)
-            x.extend(datavals[0::2])        ## every other data point starting at the zeroth
-            y.extend(datavals[1::2])        ## every other data point starting at the first
+            try:
+                ## Normalize the delimiters with two C-level replaces and let NumPy's parser convert
+                ## the tokens; str.split discards empty strings on its own.
+                datavals = array(stripped.replace(',', ' ').replace(';', ' ').split(), dtype=float64)
+            except ValueError:
+                continue        ## skip any line containing non-numeric tokens
+            x_chunks.append(datavals[0::2])     ## every other data point starting at the zeroth
+            y_chunks.append(datavals[1::2])     ## every other data point starting at the first
         elif datastart and isinstance(datatype,list):
             ## If the line does not start with '##' or '$$' then it should be a data line.
             ## The pair of lines below involve regex splitting on floating point numbers and integers. We can't just
             ## split on spaces because JCAMP allows minus signs to replace spaces in the case of negative numbers.
-            datavals = jcamp_parse(line)
+            datavals = jcamp_parse(stripped if (raw is None) else raw)
             datalist += datavals
 
     if ('xydata' in jcamp_dict) and (jcamp_dict['xydata'] == '(X++(Y..Y))'):
@@ -289,10 +479,20 @@ def jcamp_read(filehandle):
         ## X-values in the xydata-table are used for x-checks only. The variable "xfactor" is used
         ##          to compress x-values, so decompression of actual x-values is not needed anymore.
         x = linspace(jcamp_dict["firstx"], jcamp_dict["lastx"], jcamp_dict["npoints"])
-        y = array([float(yval) for yval in y])
+        if isinstance(y, list):
+            y = asarray(y, dtype=float64)
+    elif x_chunks:
+        ## The (XY..XY) paths collect one small array per line; a single concatenate assembles the
+        ## final vectors with one allocation and one copy pass per chunk.
+        x = concatenate(x_chunks)
+        y = concatenate(y_chunks)
+        if ('xfactor' in jcamp_dict):
+            x = x * jcamp_dict['xfactor']
     else:
-        x = array([float(xval) for xval in x])
-        y = array([float(yval) for yval in y])
+        ## Let NumPy's C-level converter build the arrays in one pass, instead of first creating an
+        ## intermediate Python list of floats.
+        x = asarray(x, dtype=float64)
+        y = asarray(y, dtype=float64)
         ## The "xfactor" variables contain any scaling information that may need to be applied
         ## to the data. Go ahead and apply them.
         if ('xfactor' in jcamp_dict):
@@ -308,8 +508,11 @@ def jcamp_read(filehandle):
     if ('yfactor' in jcamp_dict):
         y *= jcamp_dict['yfactor']
 
-    jcamp_dict['x'] = x
-    jcamp_dict['y'] = y
+    ## Guarantee C-contiguous float64 arrays to callers. Every path above already produces float64,
+    ## so this is normally a no-op view, but it means downstream consumers (matplotlib in
+    ## particular) never have to make their own converted copy of the data.
+    jcamp_dict['x'] = ascontiguousarray(x, dtype=float64)
+    jcamp_dict['y'] = ascontiguousarray(y, dtype=float64)
 
     return(jcamp_dict)
 
@@ -338,8 +541,8 @@ def jcamp_calc_xsec(jcamp_dict, wavemin=None, wavemax=None, skip_nonquant=True,
         missing quantitative values with defaults.
     '''
 
-    x = array(jcamp_dict['x'])  ## use 'array' to force a copy so that we cannot change the original data
-    y = array(jcamp_dict['y'])  ## use 'array' to force a copy so that we cannot change the original data
+    x = array(jcamp_dict['x'], dtype=float64)  ## use 'array' to force a copy so that we cannot change the original data
+    y = array(jcamp_dict['y'], dtype=float64)  ## use 'array' to force a copy so that we cannot change the original data
 
     T = 296.0            ## the temperature (23 degC) used by NIST when collecting spectra
     R = 1.0355E-25       ## the constant for converting data (includes the gas constant)
@@ -349,7 +552,9 @@ def jcamp_calc_xsec(jcamp_dict, wavemin=None, wavemax=None, skip_nonquant=True,
     ## grid. In this case here, we keep the sampling grid nonuniform in wavelength space, such that each digital
     ## bin retains its proportionality to energy, which is what we want.
     if (jcamp_dict['xunits'].lower() in ('1/cm', 'cm-1', 'cm^-1')):
-        jcamp_dict['wavenumbers'] = array(x)            ## note that array() always performs a copy
+        ## `x` is already a private copy, and `10000.0 / x` allocates a fresh array, so the original
+        ## can be stored directly -- no further defensive copy is needed.
+        jcamp_dict['wavenumbers'] = x
         x = 10000.0 / x
         jcamp_dict['wavelengths'] = x
     elif (jcamp_dict['xunits'].lower() in ('micrometers', 'um', 'wavelength (um)')):
@@ -362,23 +567,23 @@ def jcamp_calc_xsec(jcamp_dict, wavemin=None, wavemax=None, skip_nonquant=True,
     else:
         raise ValueError('Don\'t know how to convert the spectrum\'s x units ("' + jcamp_dict['xunits'] + '") to micrometers.')
 
-    ## Correct for any unphysical negative values.
-    y[y < 0.0] = 0.0
-
-    ## Make sure "y" refers to absorbance.
+    ## Make sure "y" refers to absorbance. Each branch corrects for unphysical negative values with
+    ## a single in-place ufunc pass, rather than materializing a boolean mask for a masked store.
     if (jcamp_dict['yunits'].lower() == 'transmittance'):
-        ## If in transmittance, then any y > 1.0 are unphysical.
-        y[y > 1.0] = 1.0
+        ## If in transmittance, then any y outside [0, 1] are unphysical: clamp in one vectorized pass.
+        clip(y, 0.0, 1.0, out=y)
 
-        ## Convert to absorbance.
+        ## Convert to absorbance. Compute the mask once and reuse it for both branches, and use
+        ## -log10(y) rather than log10(1/y): one ufunc call instead of a divide followed by a log.
         okay = (y > 0.0)
-        y[okay] = log10(1.0 / y[okay])
+        y[okay] = -log10(y[okay])
         y[logical_not(okay)] = nan
 
         jcamp_dict['absorbance'] = y
     elif (jcamp_dict['yunits'].lower() == 'absorbance'):
-        pass
+        maximum(y, 0.0, out=y)
     elif (jcamp_dict['yunits'].lower() == '(micromol/mol)-1m-1 (base 10)'):
+        maximum(y, 0.0, out=y)
         jcamp_dict['yunits'] = 'xsec (m^2))'
         jcamp_dict['xsec'] = y / 2.687e19
         return
@@ -425,8 +630,11 @@ def jcamp_calc_xsec(jcamp_dict, wavemin=None, wavemax=None, skip_nonquant=True,
         if skip_nonquant: return({'info':None, 'x':None, 'xsec':None, 'y':None})
         p = 150.0
 
-    ## Convert the absorbance units to cross-section in meters squared per molecule.
-    xsec = y * T * R / (p * ell)
+    ## Convert the absorbance units to cross-section in meters squared per molecule. Fold the scalar
+    ## factors into a single constant first, so the array is traversed once instead of three times.
+    ## Scale into a fresh array (not in place): `y` may also be stored as 'absorbance' above.
+    scale = T * R / (p * ell)
+    xsec = y * scale
 
     ## Add the "xsec" values to the data dictionary.
     jcamp_dict['xsec'] = xsec
@@ -454,27 +662,19 @@ def is_float(s):
             raise TypeError("Input {} is not a list of strings".format(s))
         if (len(s) == 0):
             raise ValueError('Input {} is empty'.format(s))
-        else:
-            bool = list(True for i in range(0,len(s)))
-            for i in range(0,len(s)):
-                try:
-                    float(s[i])
-                except ValueError:
-                    bool[i] = False
-        return(bool)
+        return([FLOAT_PATTERN.match(i) is not None for i in s])
     else:
         if not isinstance(s, str):
             raise TypeError("Input '%s' is not a string" % (s))
 
-        try:
-            float(s)
-            return(True)
-        except ValueError:
-            return(False)
+        return(FLOAT_PATTERN.match(s) is not None)
 
 ##=====================================================================================================
 def get_value(num, is_dif, vals):
-    n = float(num)
+    ## Parse integer tokens through int(): it is faster than float(), and keeping DIF accumulation
+    ## in exact integer arithmetic avoids any rounding drift over long difference chains. (The
+    ## compiled kernel used by jcamp_parse builds its numbers the same way.)
+    n = float(num) if ('.' in num) else int(num)
     if is_dif:
         lastval = vals[-1]
         val = n + lastval
@@ -484,71 +684,124 @@ def get_value(num, is_dif, vals):
     return(val)
 
 ##=====================================================================================================
-def jcamp_parse(line):
-    line = line.strip()
+@njit(cache=True, nogil=True)
+def _parse_line_kernel(buf, out):
+    '''
+    Decode one JCAMP data line, given as a uint8 buffer of ASCII codes, into the float64 buffer `out`.
 
-    datavals = []
-    num = ""
+    The accumulated number is built with integer arithmetic (no str -> float conversion), and SQZ/DIF
+    codes are recognized through the byte-indexed `SQZ_SIGN`/`SQZ_DIGIT`/`DIF_VAL` tables. Returns the
+    number of values written into `out`, or `-(i+1)` if an unknown character was found at position `i`.
+    '''
+
+    nvals = 0
+    num_int = 0
+    num_frac = 0
+    frac_pow = 1.0
+    sign = 1
+    has_num = False
+    in_frac = False
+    dif_mode = False
+    nbuf = buf.size
+
+    for i in range(nbuf):
+        ## Coerce to plain int: without numba the uint8/int8 scalars would otherwise propagate into
+        ## the accumulators and silently wrap at 256 (the njit path widens to int64 either way).
+        b = int(buf[i])
+
+        if (48 <= b <= 57):
+            ## An ordinary ASCII digit: accumulate into the integer or fractional part.
+            if in_frac:
+                num_frac = (num_frac * 10) + (b - 48)
+                frac_pow *= 10.0
+            else:
+                num_int = (num_int * 10) + (b - 48)
+            has_num = True
+            continue
+        if (b == 46):       ## '.'
+            in_frac = True
+            has_num = True
+            continue
 
-    ## Convert whitespace into single space by splitting the string then re-assembling with single spaces.
-    line = ' '.join(line.split())
+        ## Any other recognized character terminates the pending token.
+        is_delim = (b == 32) or (b == 44) or (b == 9) or (b == 13) or (b == 10)
+        sqz_sign = int(SQZ_SIGN[b])
+        dif_val = int(DIF_VAL[b])
+        dup_mul = int(DUP_MUL[b])
+        if is_delim or (sqz_sign != 0):
+            dif_mode = False        ## delimiters and SQZ codes reset DIF mode before the flush
+        elif (dif_val == 127) and (dup_mul == 0):
+            return(-(i + 1))        ## unknown character: report its position to the caller
+
+        if has_num:
+            val = sign * (num_int + (num_frac / frac_pow))
+            if dif_mode and (nvals > 0):
+                val += out[nvals-1]
+            out[nvals] = val
+            nvals += 1
+
+        ## Start the next token from the code character itself.
+        num_int = 0
+        num_frac = 0
+        frac_pow = 1.0
+        sign = 1
+        has_num = False
+        in_frac = False
+        if (sqz_sign != 0):
+            sign = sqz_sign
+            if (SQZ_DIGIT[b] >= 0):
+                num_int = int(SQZ_DIGIT[b])
+                has_num = True
+        elif (dup_mul != 0):
+            ## A DUP pseudo-digit: repeat the last value, or, in DIF mode, keep applying the
+            ## last difference.
+            if dif_mode and (nvals >= 2):
+                delta = out[nvals-1] - out[nvals-2]
+            else:
+                delta = 0.0
+            for _ in range(dup_mul - 1):
+                out[nvals] = out[nvals-1] + delta
+                nvals += 1
+        elif not is_delim:
+            ## A DIF pseudo-digit: the token is a difference relative to the previous value.
+            dif_mode = True
+            if (dif_val < 0):
+                sign = -1
+                num_int = -dif_val
+            else:
+                num_int = dif_val
+            has_num = True
+
+    ## Flush the final token, keeping the DIF mode it was started in.
+    if has_num:
+        val = sign * (num_int + (num_frac / frac_pow))
+        if dif_mode and (nvals > 0):
+            val += out[nvals-1]
+        out[nvals] = val
+        nvals += 1
 
-    ## If there are any coded digits, then replace the codes with the appropriate numbers.
+    return(nvals)
+
+##=====================================================================================================
+def jcamp_parse(line):
+    ## The kernel decodes all three compression schemes in a single scan:
     ## 'DUP_digits': ("duplicate suppression") replaces all but first value if two or more adjacent y-values
     #                are identical
     ## 'DIF_digits': ("difference form") replace delimiter, leading digit and sign of the difference between
     ##               adjacent values
     ## 'SQZ_digits': ("squeezed form") replace delimiter, leading digit and sign
-    DUP_set = set(DUP_digits)
-
-    if any(c in DUP_set for c in line):
-        ## Split the line into individual characters so that you can check for coded characters one-by-one.
-        newline = ''
-        for (i,c) in enumerate(line):
-            if (c in DUP_digits):
-                ## Check for last DIF_digit which is start of last y-value by default, so that all
-                ## characters belonging to last value is fully decompressed by DUP compression.
-                back = 1
-                while line[i-back] not in DIF_digits:
-                    back += 1
-                prev_c = line[i-back:i]
-                mul = DUP_digits[c]
-                newline += prev_c * (mul-1)
-            else:
-                mul = ''
-                newline += c
-        line = "".join(newline)
-
-    DIF = False
-    for c in line:
-        if c.isdigit() or (c == "."):
-            num += c
-        elif (c == ' '):
-            DIF = False
-            if num:
-                n = get_value(num, DIF, datavals)
-                datavals.append(n)
-            num = ''
-        elif (c in SQZ_digits):
-            DIF = False
-            if num:
-                n = get_value(num, DIF, datavals)
-                datavals.append(n)
-            num = SQZ_digits[c]
-        elif (c in DIF_digits):
-            if num:
-                n = get_value(num, DIF, datavals)
-                datavals.append(n)
-            DIF = True
-            num = str(DIF_digits[c])
-        else:
-            raise Exception("Unknown character (%s) encountered while parsing data" % c)
 
-    if num:
-        n = get_value(num, DIF, datavals)
-        datavals.append(n)
+    ## Hand the line to the compiled kernel as a buffer of ASCII codes. Each character produces at most
+    ## one value, except for a DUP code which can emit up to eight extra copies.
+    if isinstance(line, str):
+        line = line.encode('ascii','ignore')
+    buf = frombuffer(line, dtype=uint8)
+    out = empty(9 * buf.size + 1, dtype=float64)
+    nvals = _parse_line_kernel(buf, out)
+    if (nvals < 0):
+        raise Exception("Unknown character (%s) encountered while parsing data" % chr(buf[-nvals - 1]))
 
-    return(datavals)
+    return(out[:nvals].tolist())
 
 ##=====================================================================================================
 def jcamp_writefile(filename, jcamp_dict_input, linewidth=75):
@@ -600,17 +853,19 @@ def jcamp_write(jcamp_dict, linewidth=75):
     if ('y' not in jcamp_dict):
         raise ValueError('The input dictionary *must* have a "y" variable for writing to a JCAMP file.')
 
-    js = ''
+    ## Collect the output in a list of fragments and join once at the end: repeated `js += ...`
+    ## concatenation grows quadratically with the number of data points.
+    parts = []
 
     ## Write the first line.
-    js += "##JCAMP-DX=5.01\n"
+    parts.append("##JCAMP-DX=5.01\n")
 
     ## First write out the header.
     for key in jcamp_dict:
         if key in ('x','y','xydata','end'):
             continue
 
-        js += f"##{key.upper()}={str(jcamp_dict[key])}\n"
+        parts.append(f"##{key.upper()}={str(jcamp_dict[key])}\n")
 
     ## Determine whether the spectra have a title and a datetime field in the labels, by default, the title if any will
     ## be is the first string; the timestamp will be the fist datetime.datetime.
@@ -618,53 +873,93 @@ def jcamp_write(jcamp_dict, linewidth=75):
     y = jcamp_dict['y']
 
     if 'firstx' not in jcamp_dict:
-        js += f"##FIRSTX={jcamp_dict['x'][0]:.6f}\n"
+        parts.append(f"##FIRSTX={x[0]:.6f}\n")
     if 'lastx' not in jcamp_dict:
-        js += f"##LASTX={jcamp_dict['x'][-1]:.6f}\n"
+        parts.append(f"##LASTX={x[-1]:.6f}\n")
     if 'maxx' not in jcamp_dict:
-        js += f"##MAXX={amax(jcamp_dict['x']):.6f}\n"
+        parts.append(f"##MAXX={amax(x):.6f}\n")
     if 'minx' not in jcamp_dict:
-        js += f"##MINX={amin(jcamp_dict['x']):.6f}\n"
+        parts.append(f"##MINX={amin(x):.6f}\n")
 
     if 'firsty' not in jcamp_dict:
-        js += f"##FIRSTY={jcamp_dict['y'][0]:.4f}\n"
+        parts.append(f"##FIRSTY={y[0]:.4f}\n")
     if 'lasty' not in jcamp_dict:
-        js += f"##LASTY={jcamp_dict['y'][-1]:.4f}\n"
+        parts.append(f"##LASTY={y[-1]:.4f}\n")
     if 'maxy' not in jcamp_dict:
-        js += f"##MAXY={amax(jcamp_dict['y']):.4f}\n"
+        parts.append(f"##MAXY={amax(y):.4f}\n")
     if 'miny' not in jcamp_dict:
-        js += f"##MINY={amin(jcamp_dict['y']):.4f}\n"
+        parts.append(f"##MINY={amin(y):.4f}\n")
 
-    npts = jcamp_dict.get('npts', len(jcamp_dict['x']))
-    js += f"##NPOINTS={npts}\n"
-    js += f"##XFACTOR={jcamp_dict.get('xfactor', 1)}\n"
+    npts = jcamp_dict.get('npts', len(x))
+    parts.append(f"##NPOINTS={npts}\n")
+    parts.append(f"##XFACTOR={jcamp_dict.get('xfactor', 1)}\n")
     yfactor = jcamp_dict.get('yfactor', 1)
-    js += f"##YFACTOR={yfactor}\n"
-    js += "##XYDATA=(X++(Y..Y))\n"
-
-    line = f"{jcamp_dict['x'][0]:.6f} "
-    for j in arange(npts):
-        if isnan(jcamp_dict['y'][j]):
-            line += '? '
+    parts.append(f"##YFACTOR={yfactor}\n")
+    parts.append("##XYDATA=(X++(Y..Y))\n")
+
+    ## Track the running line length with a counter so that no intermediate line string is ever built.
+    piece = f"{x[0]:.6f} "
+    parts.append(piece)
+    linelen = len(piece)
+    for j in range(npts):
+        if isnan(y[j]):
+            piece = '? '
         else:
-            line += f"{jcamp_dict['y'][j] / yfactor:.4f} "
+            piece = f"{y[j] / yfactor:.4f} "
+        parts.append(piece)
+        linelen += len(piece)
 
-        print(npts-1, j, linewidth, len(line), f'"{line}"')
-        if (len(line) >= linewidth) or (j == npts-1):
-            js += line + '\n'
+        if (linelen >= linewidth) or (j == npts-1):
+            parts.append('\n')
             if (j < npts-1):
-                line = f"{jcamp_dict['x'][j+1]:.6f} "
+                piece = f"{x[j+1]:.6f} "
+                parts.append(piece)
+                linelen = len(piece)
 
-    js += '##END=\n'
-    return(js)
+    parts.append('##END=\n')
+    return(''.join(parts))
+
+##=====================================================================================================
+@functools.lru_cache(maxsize=32)
+def _cached_jcamp_readfile(filename, mtime):
+    '''
+    Memoized wrapper around `jcamp_readfile`, used by the demo script below so that repeated runs in
+    the same session skip re-parsing. The file's modification time is part of the cache key, so
+    editing a file invalidates its entry.
+    '''
+    return(jcamp_readfile(filename))
 
 ## =================================================================================================
 ## =================================================================================================
 
 if (__name__ == '__main__'):
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+    import matplotlib
+    if (not sys.stdout.isatty()) or os.environ.get('JCAMP_HEADLESS'):
+        ## No terminal attached (or headless mode forced): render with the non-interactive Agg
+        ## backend so the demo does not try to open GUI windows. Must happen before pyplot loads.
+        matplotlib.use('Agg')
     import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    def readfile_cached(filename):
+        return(_cached_jcamp_readfile(filename, os.path.getmtime(filename)))
+
+    ## Parse all of the demo files up front on a thread pool -- the file reads and ASDF decoding
+    ## release the GIL often enough to overlap, while all plotting stays on the main thread.
+    demo_files = ['./data/infrared_spectra/ethylene.jdx',
+                  './data/uvvis_spectra/toluene.jdx',
+                  './data/mass_spectra/ethanol_ms.jdx',
+                  './data/raman_spectra/tannic_acid.jdx',
+                  './data/neutron_scattering_spectra/emodine.jdx',
+                  './data/infrared_spectra/example_compound_file.jdx',
+                  './data/infrared_spectra/example_multiline_datasets.jdx']
+    with ThreadPoolExecutor() as executor:
+        spectra = dict(zip(demo_files, executor.map(readfile_cached, demo_files)))
+
     filename = './data/infrared_spectra/ethylene.jdx'
-    jcamp_dict = jcamp_readfile(filename)
+    jcamp_dict = spectra[filename]
     plt.plot(jcamp_dict['x'], jcamp_dict['y'])
     plt.title(filename)
     plt.xlabel(jcamp_dict['xunits'])
@@ -683,23 +978,29 @@ if (__name__ == '__main__'):
 
     filename = './data/uvvis_spectra/toluene.jdx'
     plt.figure()
-    jcamp_dict = jcamp_readfile(filename)
+    jcamp_dict = spectra[filename]
     plt.plot(jcamp_dict['x'], jcamp_dict['y'], 'r-')
     plt.title(filename)
     plt.xlabel(jcamp_dict['xunits'])
     plt.ylabel(jcamp_dict['yunits'])
 
     filename = './data/mass_spectra/ethanol_ms.jdx'
-    jcamp_dict = jcamp_readfile(filename)
+    jcamp_dict = spectra[filename]
     plt.figure()
-    for n in arange(len(jcamp_dict['x'])):
-        plt.plot((jcamp_dict['x'][n],jcamp_dict['x'][n]), (0.0, jcamp_dict['y'][n]), 'm-', linewidth=2.0)
+    ## Draw all of the vertical peak lines with a single LineCollection artist rather than one
+    ## Line2D per peak: for a dense stick spectrum the per-peak loop makes the figure very slow.
+    ms_x = jcamp_dict['x']      ## already contiguous float64 -- see the end of jcamp_read()
+    ms_y = jcamp_dict['y']
+    segments = stack([column_stack((ms_x, zeros_like(ms_y))), column_stack((ms_x, ms_y))], axis=1)
+    ax = plt.gca()
+    ax.add_collection(LineCollection(segments, colors='m', linewidths=2.0))
+    ax.autoscale_view()
     plt.title(filename)
     plt.xlabel(jcamp_dict['xunits'])
     plt.ylabel(jcamp_dict['yunits'])
 
     filename = './data/raman_spectra/tannic_acid.jdx'
-    jcamp_dict = jcamp_readfile(filename)
+    jcamp_dict = spectra[filename]
     plt.figure()
     plt.plot(jcamp_dict['x'], jcamp_dict['y'], 'k-')
     plt.title(filename)
@@ -707,7 +1008,7 @@ if (__name__ == '__main__'):
     plt.ylabel(jcamp_dict['yunits'])
 
     filename = './data/neutron_scattering_spectra/emodine.jdx'
-    jcamp_dict = jcamp_readfile(filename)
+    jcamp_dict = spectra[filename]
     plt.figure()
     plt.plot(jcamp_dict['x'], jcamp_dict['y'], 'k-')
     plt.title(filename)
@@ -715,16 +1016,19 @@ if (__name__ == '__main__'):
     plt.ylabel(jcamp_dict['yunits'])
 
     filename = './data/infrared_spectra/example_compound_file.jdx'
-    jcamp_dict = jcamp_readfile(filename)
+    jcamp_dict = spectra[filename]
     plt.figure()
-    for c in jcamp_dict['children']:
-        plt.plot(c['x'], c['y'])
+    ## Plot all of the children blocks as one LineCollection artist rather than one Line2D each.
+    curves = [column_stack((c['x'], c['y'])) for c in jcamp_dict['children']]
+    ax = plt.gca()
+    ax.add_collection(LineCollection(curves))
+    ax.autoscale_view()
     plt.xlabel(jcamp_dict['children'][0]['xunits'])  ## assume all blocks have the same units
     plt.ylabel(jcamp_dict['children'][0]['yunits'])
     plt.title(filename)
 
     filename = './data/infrared_spectra/example_multiline_datasets.jdx'
-    jcamp_dict = jcamp_readfile(filename)
+    jcamp_dict = spectra[filename]
     plt.figure()
     plt.plot(jcamp_dict['x'], jcamp_dict['y'])
     plt.title(filename)
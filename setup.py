@@ -18,7 +18,7 @@ setup(
     author_email="and.the.light.shattered@gmail.com",
     url="https://github.com/nzhagen/jcamp",
     download_url="https://github.com/nzhagen/jcamp",
-    install_requires=['numpy','datetime'],
+    install_requires=['numpy','datetime','numba'],
     test_suite='tests',
     tests_require=['tox', 'coverage'],
     keywords=["jcamp", "jcamp-dx", "spectra"],
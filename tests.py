@@ -101,6 +101,27 @@ class TestJcamp(unittest.TestCase):
         line = "A000J000JU%%"
         self.assertEqual(jcamp_parse(line), [1000, 2000, 2001, 2002, 2003, 2003, 2003])
 
+    def test_line_parse_without_numba(self):
+        ## Re-import the module with numba blocked so that the pure-Python fallback kernel runs.
+        ## The accumulators must be plain Python ints there: uint8 arithmetic wraps at 256 and
+        ## would silently corrupt any value >= 256 (or any fraction with more than two digits).
+        import importlib
+        import sys
+        import jcamp
+        saved_numba = sys.modules.get('numba')
+        sys.modules['numba'] = None     ## makes "import numba" raise ImportError
+        try:
+            jcamp_nojit = importlib.reload(jcamp)
+            self.assertEqual(jcamp_nojit.jcamp_parse("1000 2000 2001"), [1000, 2000, 2001])
+            self.assertEqual(jcamp_nojit.jcamp_parse("0.95327 449.470"), [0.95327, 449.470])
+            self.assertEqual(jcamp_nojit.jcamp_parse("A000J000JU%%"), [1000, 2000, 2001, 2002, 2003, 2003, 2003])
+        finally:
+            if saved_numba is None:
+                sys.modules.pop('numba', None)
+            else:
+                sys.modules['numba'] = saved_numba
+            importlib.reload(jcamp)
+
     def test_jcamp_readfile_dict(self):
         filename = './data/infrared_spectra/methane.jdx'
         jcamp_dict = jcamp_readfile(filename)